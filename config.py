@@ -4,11 +4,112 @@ Configuration module for topology discovery.
 This module handles device configuration and settings.
 """
 
+import os
+import logging
+import threading
+from collections import Counter
+from functools import lru_cache
+
+from constants import DEFAULT_SSH_PORT
+
+log = logging.getLogger(__name__)
+
+# lru_cache doesn't serialize concurrent misses; this makes workers share one parse
+_ssh_config_lock = threading.Lock()
+
+
+def load_ssh_config(path):
+    """
+    Parse an OpenSSH client config file once per path, even across threads.
+
+    Args:
+        path: Path to SSH config file; a leading '~' is expanded.
+
+    Returns:
+        paramiko.SSHConfig shared by every device using this file; empty if
+        the file does not exist, as Netmiko and OpenSSH treat it.
+    """
+
+    with _ssh_config_lock:
+        return _parse_ssh_config(path)
+
+
+@lru_cache(maxsize=8)
+def _parse_ssh_config(path):
+    """Parse an SSH config file; see load_ssh_config()."""
+
+    import paramiko  # deferred: heavy import, only needed with an SSH config
+
+    ssh_config = paramiko.SSHConfig()
+    try:
+        with open(os.path.expanduser(path)) as f:
+            ssh_config.parse(f)
+    except FileNotFoundError:
+        log.warning(f"SSH config file not found, ignoring it: {path}")
+    return ssh_config
+
+
+def resolve_ssh_params(host, username=None, port=DEFAULT_SSH_PORT, ssh_config_file=None):
+    """
+    Resolve SSH connection parameters for host against an SSH config file.
+
+    Explicit username and port win; HostName, User, Port, the first existing
+    IdentityFile and ProxyCommand / ProxyJump from the matching Host entry
+    fill in the rest, so the connection itself never needs to read the
+    config file.
+
+    Args:
+        host: Device hostname, IP address or SSH config alias.
+        username: SSH username.
+        port: SSH port number.
+        ssh_config_file: Path to SSH config file.
+
+    Returns:
+        Dictionary with hostname, username, port, identity_file and
+        proxy_command (None when not configured).
+    """
+
+    params = {
+        'hostname': host,
+        'username': username,
+        'port': port,
+        'identity_file': None,
+        'proxy_command': None,
+    }
+
+    if not ssh_config_file:
+        return params
+
+    host_config = load_ssh_config(ssh_config_file).lookup(host)
+
+    params['hostname'] = host_config.get('hostname', host)
+    if not username:
+        params['username'] = host_config.get('user')
+    if port == DEFAULT_SSH_PORT and 'port' in host_config:
+        params['port'] = int(host_config['port'])
+
+    # Like OpenSSH, skip IdentityFile entries that don't exist rather than
+    # failing the connection before password authentication is tried
+    identity_files = (os.path.expanduser(f) for f in host_config.get('identityfile', ()))
+    params['identity_file'] = next((f for f in identity_files if os.path.isfile(f)), None)
+
+    if 'proxycommand' in host_config:
+        params['proxy_command'] = host_config['proxycommand']
+    elif 'proxyjump' in host_config:
+        # -F keeps the jump hosts resolved from the same SSH config; the last
+        # hop forwards the connection and any earlier ones are chained with -J
+        config_path = os.path.expanduser(ssh_config_file)
+        *hops, last_hop = host_config['proxyjump'].split(",")
+        chain = f" -J {','.join(hops)}" if hops else ""
+        params['proxy_command'] = f"ssh -F {config_path}{chain} -W {params['hostname']}:{params['port']} {last_hop}"
+
+    return params
+
 
 class DeviceConfig:
     """Configuration for a single network device."""
 
-    def __init__(self, host="", username=None, password=None, port=22, ssh_config_file=None):
+    def __init__(self, host="", username=None, password=None, port=DEFAULT_SSH_PORT, ssh_config_file=None):
 
         self.host = host
         self.username = username
@@ -40,12 +141,11 @@ def get_default_devices():
     dev_list = _get_default_devices()
 
     # Check for duplicates based on host
-    hosts = [device.host for device in dev_list]
-    duplicates = [host for host in hosts if hosts.count(host) > 1]
+    host_counts = Counter(device.host for device in dev_list)
+    duplicates = [host for host, count in host_counts.items() if count > 1]
 
     if duplicates:
-        unique_duplicates = list(set(duplicates))
-        raise ValueError(f"Duplicate device hosts found: {', '.join(unique_duplicates)}")
+        raise ValueError(f"Duplicate device hosts found: {', '.join(duplicates)}")
 
     return dev_list
 
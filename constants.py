@@ -8,14 +8,44 @@ DEFAULT_OUTPUT_FILE = "topology.html"
 # Default SSH port
 DEFAULT_SSH_PORT = 22
 
+# Netmiko timing defaults for SONiC (Linux shell, no pager or enable mode).
+# Use delay_factor=3, fast_cli=False to restore the old conservative timing.
+DEFAULT_DELAY_FACTOR = 0.1
+DEFAULT_FAST_CLI = True
+DEFAULT_READ_TIMEOUT = 30
+BULK_READ_TIMEOUT = 60  # minimum for the single send of all discovery commands
+
+# SSH connection pool limits in seconds
+# (override with SONIC_POOL_IDLE_TIMEOUT / SONIC_POOL_MAX_AGE)
+POOL_IDLE_TIMEOUT = 300
+POOL_MAX_AGE = 3600
+
+# SSH transport keepalive interval in seconds for pooled connections
+SSH_KEEPALIVE_INTERVAL = 30
+
+# Upper bound on devices discovered concurrently
+MAX_DISCOVERY_WORKERS = 32
+
+# Default worker count for Router_Sonic.gather(); stays under sshd's
+# default MaxStartups=10 unauthenticated connections per destination
+GATHER_MAX_WORKERS = 8
+SSH_MAX_STARTUPS = 10
+
 # Template paths
 TEMPLATE_DIR = "templates"
 TOPOLOGY_TEMPLATE = "topology.html"
 
+# vis-network library (pinned so the on-disk cache stays valid)
+VIS_NETWORK_VERSION = "9.1.9"
+VIS_NETWORK_URL = f"https://unpkg.com/vis-network@{VIS_NETWORK_VERSION}/standalone/umd/vis-network.min.js"
+
+# Per-user cache directory name (under $XDG_CACHE_HOME or ~/.cache)
+CACHE_DIR_NAME = "gns-sonic-lldp"
+
 # TextFSM template paths
 TEXTFSM_DIR = "textfsm"
 INTERFACE_STATUS_TEMPLATE = "show_interfaces_status.textfsm"
-LLDP_TABLE_TEMPLATE = "show_lldp_table.textfsm"
+VLAN_CONFIG_TEMPLATE = "show_vlan_config.textfsm"
 
 # Logging format
 LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
@@ -1,154 +1,257 @@
 """Export topology model to interactive HTML visualization."""
 
+import os
 import json
 import re
+import tempfile
 import urllib.request
 from pathlib import Path
-from collections import defaultdict
-
-from constants import TEMPLATE_DIR, TOPOLOGY_TEMPLATE, DEFAULT_OUTPUT_FILE
-
-
+from functools import lru_cache
+from collections import Counter, defaultdict
+
+from constants import (
+    TEMPLATE_DIR,
+    TOPOLOGY_TEMPLATE,
+    DEFAULT_OUTPUT_FILE,
+    VIS_NETWORK_VERSION,
+    VIS_NETWORK_URL,
+    CACHE_DIR_NAME
+)
+
+# (field, default) pairs for ports that have no PortMeta in the model
+_PORT_META_DEFAULTS = (
+    ("alias", "???"),
+    ("status", "?"),
+    ("speed", "N/A"),
+    ("mtu", "N/A"),
+    ("fec", "N/A"),
+    ("type", "N/A"),
+)
+
+# Top-level payload keys, in output order
+_PAYLOAD_KEYS = (
+    "device_nodes",
+    "device_edges",
+    "ports_by_device",
+    "port_meta",
+    "port_edges",
+    "seg_nodes",
+    "seg_edges",
+    "anomaly_notes",
+    "vlan_groups",
+)
+
+_DIGITS_RE = re.compile(r'(\d+)')
+
+# ${NAME} placeholders in the HTML template
+_PLACEHOLDER_RE = re.compile(r'\$\{(PAYLOAD_JSON|CSS_TAG|JS_TAG|VIS_NETWORK_TAG)\}')
+
+# template path -> (mtime_ns, segments) so each template is split once per process
+_template_segments_cache = {}
+
+
+@lru_cache(maxsize=4096)
 def natural_sort_key(port):
     """
     Natural sort key for port names like 'Ethernet0', 'Ethernet4', etc.
     Splits the string into text and numeric parts for proper numeric sorting.
+    Results are memoized since the same port names are sorted repeatedly.
     """
 
-    parts = re.split(r'(\d+)', port)
+    parts = _DIGITS_RE.split(port)
     # Convert numeric parts to int, keep text parts as strings
     return tuple(int(part) if part.isdigit() else part.lower() for part in parts if part)
 
 
+def _to_json(obj):
+    """Serialize obj as compact JSON."""
+
+    return json.dumps(obj, separators=(",", ":"))
+
+
 def _make_payload(model):
+    """
+    Build the visualization payload as a JSON object string.
+
+    Each top-level value is serialized as soon as it is built, so only one
+    intermediate list is alive at a time next to the JSON fragments.
+    """
+
+    parts = {}
+
+    # Local bindings for names used inside the hot loops below
+    p2p_edges = model.p2p_edges
+    seg_edges = model.seg_edges
+    sort_key = natural_sort_key
+    port_meta_defaults = _PORT_META_DEFAULTS
 
     # Device-level aggregate edges
-    agg = defaultdict(int)
-    for d1, p1, d2, p2 in model.p2p_edges:
-        a, b = (d1, d2) if d1 <= d2 else (d2, d1)
-        agg[(a, b)] += 1
-
-    device_nodes = [{"id": f"dev:{d}", "label": d, "kind": "device"} for d in sorted(model.devices)]
-    device_edges = [{"from": f"dev:{a}", "to": f"dev:{b}", "label": str(cnt), "width": min(1 + cnt, 10)}
-                    for (a, b), cnt in sorted(agg.items())]
-
-    # ports_by_device - include ALL ports from interfaces, not just linked ones
-    ports_by_device = defaultdict(set)
-    # First add all ports from interfaces (all physical ports on the device)
-    for dev, ifaces in model.interfaces.items():
-        for port in ifaces.keys():
-            ports_by_device[dev].add(port)
-    # Also ensure linked ports are included (in case they're not in interfaces)
-    for d1, p1, d2, p2 in model.p2p_edges:
-        ports_by_device[d1].add(p1)
-        ports_by_device[d2].add(p2)
-    for d, p, _ in model.seg_edges:
-        ports_by_device[d].add(p)
+    agg = Counter((d1, d2) if d1 <= d2 else (d2, d1) for d1, _, d2, _ in p2p_edges)
+
+    parts["device_nodes"] = _to_json([{"id": f"dev:{d}", "label": d, "kind": "device"} for d in sorted(model.devices)])
+    parts["device_edges"] = _to_json([{"from": f"dev:{a}", "to": f"dev:{b}", "label": str(cnt), "width": min(1 + cnt, 10)}
+                                      for (a, b), cnt in sorted(agg.items())])
+
+    # Linked ports per device (in case they're not in interfaces)
+    linked_ports = defaultdict(set)
+    for d1, p1, d2, p2 in p2p_edges:
+        linked_ports[d1].add(p1)
+        linked_ports[d2].add(p2)
+    for d, p, _ in seg_edges:
+        linked_ports[d].add(p)
 
     # Port edges
-    port_edges = [{
+    parts["port_edges"] = _to_json([{
         "from": f"port:{d1}:{p1}",
         "to": f"port:{d2}:{p2}",
         "label": f"{p1} ↔ {p2}",
         "meta": {"a_dev": d1, "a_port": p1, "b_dev": d2, "b_port": p2},
-    } for d1, p1, d2, p2 in model.p2p_edges]
+    } for d1, p1, d2, p2 in p2p_edges])
 
-    seg_nodes = [{"id": f"seg:{s}", "label": s, "kind": "segment"} for s in sorted(model.seg_nodes)]
-    seg_edges = [{
+    parts["seg_nodes"] = _to_json([{"id": f"seg:{s}", "label": s, "kind": "segment"} for s in sorted(model.seg_nodes)])
+    parts["seg_edges"] = _to_json([{
         "from": f"port:{d}:{p}",
         "to": f"seg:{seg}",
         "label": "shared",
         "meta": {"dev": d, "port": p, "seg": seg},
-    } for d, p, seg in model.seg_edges]
+    } for d, p, seg in seg_edges])
 
     anomaly_notes = []
+    seg_neighbors_lookup = model.seg_neighbor_devs.get
     for dev, lp in sorted(model.anomalous_ports):
         seg = f"SEG:{dev}:{lp}"
-        nbrs = sorted({rd for rd, _ in (model.seg_members.get(seg, set()) or set())})
+        nbrs = seg_neighbors_lookup(seg, [])
         anomaly_notes.append(f"{dev}:{lp} sees multiple neighbors: {', '.join(nbrs)}")
+    parts["anomaly_notes"] = _to_json(anomaly_notes)
 
-    # Build reverse mapping: port -> VLAN ID from vlan_membership
-    port_to_vlan = {}
-    for dev in ports_by_device.keys():
-        if dev in model.vlan_membership:
-            for vlan_id, vlan_ports in model.vlan_membership[dev].items():
-                for port in vlan_ports:
-                    key = f"{dev}:{port}"
-                    port_to_vlan[key] = vlan_id
-
+    # Single sweep per device builds its port list, port meta and VLAN groups.
     # Port meta needs to be JSON-able - include meta for ALL ports
+    ports_by_device = {}
     port_meta = {}
-    for dev, ports in ports_by_device.items():
+    vlan_groups = {}
+    pm_lookup = model.port_meta.get
+    iface_lookup = model.interfaces.get
+    vlan_lookup = model.vlan_membership.get
+    for dev in sorted(model.interfaces.keys() | linked_ports.keys()):
+        dev_ifaces = iface_lookup(dev) or {}
+        # Include ALL ports from interfaces, not just linked ones
+        ports = linked_ports.get(dev, set()).union(dev_ifaces)
+
+        # model.vlan_membership[dev] is dict mapping VLAN_ID -> list of ports
+        # (from 'show vlan config'); build the reverse port -> VLAN ID map
+        dev_vlans = vlan_lookup(dev) or {}
+        port_to_vlan = {port: vlan_id for vlan_id, vlan_ports in dev_vlans.items() for port in vlan_ports}
+
         for port in ports:
             key = f"{dev}:{port}"
-            # Get VLAN ID from vlan_membership (more accurate than interface status)
-            vlan_id = port_to_vlan.get(key)
-
-            if key in model.port_meta:
-                pm = model.port_meta[key]
-                port_meta[key] = {
+            pm = pm_lookup(key)
+            if pm is not None:
+                meta = {
                     "alias": pm.alias,
                     "status": pm.status,
                     "speed": pm.speed,
                     "mtu": pm.mtu,
                     "fec": pm.fec,
                     "type": pm.type,
-                    "vlan": vlan_id,  # Use VLAN from vlan_membership
                 }
             else:
                 # Create default meta for ports without explicit meta
-                iface_data = (model.interfaces.get(dev, {}) or {}).get(port, {}) or {}
-                port_meta[key] = {
-                    "alias": iface_data.get("alias", "???"),
-                    "status": iface_data.get("status", "?"),
-                    "speed": iface_data.get("speed", "N/A"),
-                    "mtu": iface_data.get("mtu", "N/A"),
-                    "fec": iface_data.get("fec", "N/A"),
-                    "type": iface_data.get("type", "N/A"),
-                    "vlan": vlan_id,  # Use VLAN from vlan_membership
-                }
+                iface_data = dev_ifaces.get(port) or {}
+                meta = {field: iface_data.get(field, default) for field, default in port_meta_defaults}
+            # Get VLAN ID from vlan_membership (more accurate than interface status)
+            meta["vlan"] = port_to_vlan.get(port)
+            port_meta[key] = meta
 
-    # Build VLAN grouping data for visualization from actual VLAN membership
-    # Use model.vlan_membership which comes from 'show vlan brief' command
-    vlan_groups = {}
-    for dev in ports_by_device.keys():
-        vlan_groups[dev] = {}
-        if dev in model.vlan_membership:
-            # model.vlan_membership[dev] is dict mapping VLAN_ID -> list of ports
-            for vlan_id, vlan_ports in model.vlan_membership[dev].items():
-                # Only include ports that are actually in our ports_by_device
-                valid_ports = [p for p in vlan_ports if p in ports_by_device[dev]]
-                if len(valid_ports) > 1:  # Only group if 2+ ports in VLAN
-                    vlan_groups[dev][vlan_id] = sorted(valid_ports, key=natural_sort_key)
-
-    return {
-        "device_nodes": device_nodes,
-        "device_edges": device_edges,
-        "ports_by_device": {k: sorted(v, key=natural_sort_key) for k, v in ports_by_device.items()},
-        "port_meta": port_meta,
-        "port_edges": port_edges,
-        "seg_nodes": seg_nodes,
-        "seg_edges": seg_edges,
-        "anomaly_notes": anomaly_notes,
-        "vlan_groups": vlan_groups,
-    }
+        # Sort once; VLAN groups below are filtered from this list and stay sorted
+        sorted_ports = sorted(ports, key=sort_key)
+        ports_by_device[dev] = sorted_ports
+
+        # Build VLAN grouping data for visualization from actual VLAN membership
+        dev_groups = {}
+        for vlan_id, vlan_ports in dev_vlans.items():
+            # Only include ports that are actually in our ports_by_device
+            valid_ports = ports.intersection(vlan_ports)
+            if len(valid_ports) > 1:  # Only group if 2+ ports in VLAN
+                dev_groups[vlan_id] = [p for p in sorted_ports if p in valid_ports]
+        vlan_groups[dev] = dev_groups
+
+    parts["ports_by_device"] = _to_json(ports_by_device)
+    parts["port_meta"] = _to_json(port_meta)
+    parts["vlan_groups"] = _to_json(vlan_groups)
+
+    return "{" + ",".join(f'"{key}":{parts[key]}' for key in _PAYLOAD_KEYS) + "}"
+
+
+def _vis_network_cache_path():
+    """Return the on-disk cache location for the pinned vis-network library."""
+
+    cache_root = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return cache_root / CACHE_DIR_NAME / f"vis-network-{VIS_NETWORK_VERSION}.min.js"
 
 
 def _download_vis_network():
     """
-    Download vis-network library from CDN and return as string.
+    Return vis-network library as string, from the local cache if present.
+    Otherwise download it from CDN and store it in the cache.
     Falls back to CDN URL if download fails.
     """
 
+    cache_file = _vis_network_cache_path()
+    if cache_file.exists():
+        try:
+            return cache_file.read_text(encoding="utf-8")
+        except OSError as e:
+            print(f"Warning: Could not read cached vis-network ({cache_file}): {e}")
+
     try:
-        url = "https://unpkg.com/vis-network/standalone/umd/vis-network.min.js"
-        with urllib.request.urlopen(url, timeout=10) as response:
-            return response.read().decode('utf-8')
+        with urllib.request.urlopen(VIS_NETWORK_URL, timeout=10) as response:
+            vis_network_js = response.read().decode('utf-8')
     except Exception as e:
         print(f"Warning: Could not download vis-network: {e}")
         print("Falling back to CDN link (requires internet connection)")
         return None
 
+    # Write to a temp file and rename it into place, so an interrupted or
+    # concurrent run never leaves a truncated library in the cache
+    tmp_path = None
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=cache_file.parent,
+                                         prefix=f".{cache_file.name}.", delete=False) as tmp:
+            tmp_path = tmp.name
+            tmp.write(vis_network_js)
+        os.replace(tmp_path, cache_file)
+    except OSError as e:
+        print(f"Warning: Could not cache vis-network to {cache_file}: {e}")
+        if tmp_path:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    return vis_network_js
+
+
+def _load_template_segments(template_file):
+    """
+    Split an HTML template at its placeholders, caching the result.
+
+    Args:
+        template_file: Path to HTML template.
+
+    Returns:
+        List alternating literal text and placeholder names (odd indices).
+    """
+
+    mtime_ns = template_file.stat().st_mtime_ns
+    cached = _template_segments_cache.get(template_file)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    segments = _PLACEHOLDER_RE.split(template_file.read_text(encoding="utf-8"))
+    _template_segments_cache[template_file] = (mtime_ns, segments)
+    return segments
+
 
 def export_vis_html(model, out_html=DEFAULT_OUTPUT_FILE, template_path=None):
     """
@@ -164,7 +267,7 @@ def export_vis_html(model, out_html=DEFAULT_OUTPUT_FILE, template_path=None):
         Path to generated HTML file.
     """
 
-    payload = _make_payload(model)
+    payload_json = _make_payload(model)
 
     if template_path is None:
         template_path = str(Path(__file__).parent / TEMPLATE_DIR / TOPOLOGY_TEMPLATE)
@@ -174,7 +277,7 @@ def export_vis_html(model, out_html=DEFAULT_OUTPUT_FILE, template_path=None):
         raise FileNotFoundError(f"Template file not found: {template_path}")
 
     template_dir = template_file.parent
-    template_content = template_file.read_text(encoding="utf-8")
+    template_segments = _load_template_segments(template_file)
 
     # Read CSS file and inline it
     css_file = template_dir / "static" / "css" / "topology.css"
@@ -192,35 +295,29 @@ def export_vis_html(model, out_html=DEFAULT_OUTPUT_FILE, template_path=None):
         js_content = "// JS file not found"
         print(f"Warning: JavaScript file not found: {js_file}")
 
-    # Download or get vis-network library
-    vis_network_js = _download_vis_network()
+    # Prefer a vendored vis-network library, otherwise use the cache/download
+    vendor_file = template_dir / "static" / "js" / "vis-network.min.js"
+    if vendor_file.exists():
+        vis_network_js = vendor_file.read_text(encoding="utf-8")
+    else:
+        vis_network_js = _download_vis_network()
     if vis_network_js:
         vis_network_tag = f"<script>\n{vis_network_js}\n</script>"
     else:
         # Fallback to CDN (requires internet)
-        vis_network_tag = '<script src="https://unpkg.com/vis-network/standalone/umd/vis-network.min.js"></script>'
-
-    # Replace template placeholders
-    html = template_content.replace("{{PAYLOAD_JSON}}", json.dumps(payload))
-
-    # Replace external CSS link with inline style
-    html = html.replace(
-        '<link rel="stylesheet" href="static/css/topology.css">',
-        css_tag
-    )
-
-    # Replace external JS script with inline script
-    html = html.replace(
-        '<script src="static/js/topology.js"></script>',
-        f"<script>\n{js_content}\n</script>"
-    )
-
-    # Replace CDN script with inline or keep CDN if download failed
-    if vis_network_js:
-        html = html.replace(
-            '<script src="https://unpkg.com/vis-network/standalone/umd/vis-network.min.js"></script>',
-            vis_network_tag
-        )
+        vis_network_tag = f'<script src="{VIS_NETWORK_URL}"></script>'
+
+    # Fill all template placeholders with a single join over the cached segments
+    values = {
+        "PAYLOAD_JSON": payload_json,
+        "CSS_TAG": css_tag,
+        "JS_TAG": f"<script>\n{js_content}\n</script>",
+        "VIS_NETWORK_TAG": vis_network_tag,
+    }
+    parts = list(template_segments)
+    for i in range(1, len(parts), 2):
+        parts[i] = values[parts[i]]
+    html = "".join(parts)
 
     output_path = Path(out_html)
     output_path.write_text(html, encoding="utf-8")
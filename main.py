@@ -3,14 +3,15 @@
 import sys
 import logging
 import signal
-import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from router_sonic import Router_Sonic
 from model import build_model
-from export_vis import export_vis_html
+from export_vis import export_vis_html, natural_sort_key
 from config import get_default_devices
 from constants import (
     DEFAULT_OUTPUT_FILE,
+    MAX_DISCOVERY_WORKERS,
     LOG_FORMAT,
     VISUALIZER_BANNER,
     VISUALIZER_TITLE
@@ -24,17 +25,6 @@ logging.basicConfig(
 log = logging.getLogger(__name__)
 
 
-def natural_sort_key(port):
-    """
-    Natural sort key for port names like 'Ethernet0', 'Ethernet4', etc.
-    Splits the string into text and numeric parts for proper numeric sorting.
-    """
-
-    parts = re.split(r'(\d+)', port)
-    # Convert numeric parts to int, keep text parts as strings
-    return tuple(int(part) if part.isdigit() else part.lower() for part in parts if part)
-
-
 def sort_anomalous_port_key(dev_port_tuple):
     """
     Sort key for (device, port) tuples using natural sort for ports.
@@ -70,9 +60,35 @@ class SonicTopologyDiscoverer:
 
         log.info(f"Starting discovery on {len(self.devices)} devices...")
 
-        for dev_config in self.devices:
-            log.info("")  # to improve readability
-            self._collect_from_device(dev_config)
+        if not self.devices:
+            return
+
+        # Collection is SSH-bound, so query all devices concurrently
+        max_workers = min(MAX_DISCOVERY_WORKERS, len(self.devices))
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = {
+            executor.submit(self._collect_from_device, dev_config): dev_config
+            for dev_config in self.devices
+        }
+
+        try:
+            for future in as_completed(futures):
+                dev_config = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    log.error(f"Discovery failed on {dev_config.host}: {e}")
+                    continue
+                if result is None:
+                    continue
+                device_hostname, device_data = result
+                self.topology_data[device_hostname] = device_data
+        except BaseException:
+            # Ctrl+C (SystemExit from handle_sigint): drop queued devices, don't wait
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+        executor.shutdown()
 
 
     def _collect_from_device(self, dev_config):
@@ -81,6 +97,9 @@ class SonicTopologyDiscoverer:
 
         Args:
             dev_config: Device configuration to connect to.
+
+        Returns:
+            Tuple of (hostname, device_data), or None if the device is unreachable.
         """
 
         log.info(f"Connecting to {dev_config.host}...")
@@ -89,44 +108,46 @@ class SonicTopologyDiscoverer:
             host=dev_config.host,
             username=dev_config.username,
             password=dev_config.password,
+            port=dev_config.port,
             ssh_config_file=dev_config.ssh_config_file
         )
 
         if not router.connect()[0]:
             log.error(f"Failed to connect to {dev_config.host}")
-            return
+            return None
 
-        status, hostname = router.get_hostname()
-        if not status:
-            log.warning(f"Failed to get hostname from {dev_config.host}, using SSH alias")
-            device_hostname = dev_config.host
-        else:
-            log.info(f"Device hostname: {hostname}")
-            device_hostname = hostname
-
-        status, iface_data = router.get_interface_status_map()
-        if not status:
-            log.error(f"Failed to get interfaces from {dev_config.host}: {iface_data}")
-            iface_data = {}
-
-        status, lldp_data = router.get_lldp_neighbors()
-        if not status:
-            log.error(f"Failed to get LLDP from {dev_config.host}: {lldp_data}")
-            lldp_data = []
-
-        status, vlan_membership = router.get_vlan_membership()
-        if not status:
-            log.warning(f"Failed to get VLAN membership from {dev_config.host}: {vlan_membership}")
-            vlan_membership = {}
-
-        self.topology_data[device_hostname] = {
+        try:
+            status, hostname = router.get_hostname()
+            if not status:
+                log.warning(f"Failed to get hostname from {dev_config.host}, using SSH alias")
+                device_hostname = dev_config.host
+            else:
+                log.info(f"Device hostname: {hostname}")
+                device_hostname = hostname
+
+            status, iface_data = router.get_interface_status_map()
+            if not status:
+                log.error(f"Failed to get interfaces from {dev_config.host}: {iface_data}")
+                iface_data = {}
+
+            status, lldp_data = router.get_lldp_neighbors()
+            if not status:
+                log.error(f"Failed to get LLDP from {dev_config.host}: {lldp_data}")
+                lldp_data = []
+
+            status, vlan_membership = router.get_vlan_membership()
+            if not status:
+                log.warning(f"Failed to get VLAN membership from {dev_config.host}: {vlan_membership}")
+                vlan_membership = {}
+        finally:
+            router.disconnect()
+
+        return device_hostname, {
             "interfaces": iface_data,
             "lldp": lldp_data,
             "vlan_membership": vlan_membership
         }
 
-        router.disconnect()
-
 
     def visualize(self, out_html=DEFAULT_OUTPUT_FILE, ignore_ports=None):
         """
@@ -162,7 +183,7 @@ class SonicTopologyDiscoverer:
 
         print(f"Topology visualization written to: {out_html}")
 
-        if not model.anomalous_ports:
+        if not model.anomalous_by_device:
             return
 
         print("\nNOTE: Shared-segment / flooded LLDP detected:")
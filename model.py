@@ -1,11 +1,19 @@
 """Topology model and data processing for network discovery."""
 
 from collections import defaultdict
+from operator import itemgetter
+
+_NO_PORTS = frozenset()
+
+# Extracts (local_port, remote_dev, remote_port) from an LLDP neighbor dict
+_get_link_fields = itemgetter("local_port", "remote_dev", "remote_port")
 
 
 class PortMeta:
     """Port metadata information."""
 
+    __slots__ = ("alias", "status", "speed", "mtu", "fec", "type", "vlan")
+
     def __init__(self, alias="???", status="?", speed="N/A", mtu="N/A", fec="N/A", type="N/A", vlan=None):
 
         self.alias = alias
@@ -20,7 +28,7 @@ class PortMeta:
 class TopologyModel:
     """Complete topology model with all processed data."""
 
-    def __init__(self, devices, interfaces, port_meta, p2p_edges, seg_nodes, seg_edges, seg_members, anomalous_ports, vlan_membership):
+    def __init__(self, devices, interfaces, port_meta, p2p_edges, seg_nodes, seg_edges, seg_members, seg_neighbor_devs, anomalous_by_device, vlan_membership):
 
         self.devices = devices  # Set of device names
         self.interfaces = interfaces  # Dict mapping device -> port -> interface metadata
@@ -29,10 +37,18 @@ class TopologyModel:
         self.seg_nodes = seg_nodes  # Set of segment node names
         self.seg_edges = seg_edges  # List of segment edges
         self.seg_members = seg_members  # Dict mapping segment -> set of (device, port) tuples
-        self.anomalous_ports = anomalous_ports  # Set of (device, port) tuples that see multiple neighbors
+        self.seg_neighbor_devs = seg_neighbor_devs  # Dict mapping segment -> sorted list of neighbor devices
+        self.anomalous_by_device = anomalous_by_device  # Dict mapping device -> frozenset of ports that see multiple neighbors
         self.vlan_membership = vlan_membership  # Dict mapping device -> VLAN_ID -> list of ports
 
 
+    @property
+    def anomalous_ports(self):
+        """Set of (device, port) tuples that see multiple neighbors."""
+
+        return {(dev, port) for dev, ports in self.anomalous_by_device.items() for port in ports}
+
+
 def normalize_edges(topology_data, ignore_ports=None):
     """
     Normalize topology data into structured format.
@@ -55,20 +71,23 @@ def normalize_edges(topology_data, ignore_ports=None):
     raw_edges = []
     vlan_membership = {}
 
+    raw_edges_append = raw_edges.append
+
     for dev, data in topology_data.items():
         interfaces[dev] = data.get("interfaces", {}) or {}
         vlan_membership[dev] = data.get("vlan_membership", {}) or {}
         for link in data.get("lldp", []) or []:
-            lp = link.get("local_port")
-            rd = link.get("remote_dev")
-            rp = link.get("remote_port")
+            try:
+                lp, rd, rp = _get_link_fields(link)
+            except KeyError:
+                continue
             if not lp or not rd or not rp:
                 continue
             if (dev, lp) in ignore_ports:
                 continue
 
             devices.add(rd)
-            raw_edges.append((dev, lp, rd, rp))
+            raw_edges_append((dev, lp, rd, rp))
 
     return devices, interfaces, raw_edges, vlan_membership
 
@@ -89,17 +108,15 @@ def dedup_bidirectional_edges(raw_edges):
 
     seen = set()
     out = []
+    seen_add = seen.add
+    out_append = out.append
 
     for a_dev, a_port, b_dev, b_port in raw_edges:
-        left = (a_dev, a_port)
-        right = (b_dev, b_port)
-        if right < left:
-            left, right = right, left
-        key = (left[0], left[1], right[0], right[1])
+        key = (a_dev, a_port, b_dev, b_port) if (a_dev, a_port) <= (b_dev, b_port) else (b_dev, b_port, a_dev, a_port)
         if key in seen:
             continue
-        seen.add(key)
-        out.append((left[0], left[1], right[0], right[1]))
+        seen_add(key)
+        out_append(key)
     return out
 
 
@@ -113,22 +130,21 @@ def detect_anomalous_ports(raw_edges):
         raw_edges: List of raw edges from LLDP data.
 
     Returns:
-        Set of (device, port) tuples that see multiple neighbors.
+        Dict mapping device -> frozenset of ports that see multiple neighbors.
     """
 
-    per_dev_port_remotes = defaultdict(lambda: defaultdict(set))
+    port_remotes = defaultdict(set)
     for a_dev, a_port, b_dev, _b_port in raw_edges:
-        per_dev_port_remotes[a_dev][a_port].add(b_dev)
+        port_remotes[(a_dev, a_port)].add(b_dev)
 
-    anomalous = set()
-    for dev, ports in per_dev_port_remotes.items():
-        for lp, rems in ports.items():
-            if len(rems) > 1:
-                anomalous.add((dev, lp))
-    return anomalous
+    anomalous = defaultdict(set)
+    for (dev, lp), rems in port_remotes.items():
+        if len(rems) > 1:
+            anomalous[dev].add(lp)
+    return {dev: frozenset(ports) for dev, ports in anomalous.items()}
 
 
-def segmentize_edges(raw_edges, anomalous_ports):
+def segmentize_edges(raw_edges, anomalous_by_device):
     """
     Convert anomalous ports into segment nodes.
 
@@ -136,7 +152,7 @@ def segmentize_edges(raw_edges, anomalous_ports):
 
     Args:
         raw_edges: List of raw edges from LLDP.
-        anomalous_ports: Set of ports that see multiple neighbors.
+        anomalous_by_device: Dict mapping device -> frozenset of ports that see multiple neighbors.
 
     Returns:
         Tuple of (p2p_raw, seg_edges, seg_members, seg_nodes):
@@ -151,8 +167,10 @@ def segmentize_edges(raw_edges, anomalous_ports):
     seg_members = defaultdict(set)
     seg_nodes = set()
 
+    anomalous_lookup = anomalous_by_device.get
+
     for a_dev, a_port, b_dev, b_port in raw_edges:
-        if (a_dev, a_port) in anomalous_ports:
+        if a_port in anomalous_lookup(a_dev, _NO_PORTS):
             seg = f"SEG:{a_dev}:{a_port}"
             seg_nodes.add(seg)
             seg_edges.append((a_dev, a_port, seg))
@@ -205,9 +223,10 @@ def build_model(topology_data, ignore_ports=None):
 
     devices, interfaces, raw_edges, vlan_membership = normalize_edges(topology_data, ignore_ports=ignore_ports)
 
-    anomalous_ports = detect_anomalous_ports(raw_edges)
-    p2p_raw, seg_edges, seg_members, seg_nodes = segmentize_edges(raw_edges, anomalous_ports)
+    anomalous_by_device = detect_anomalous_ports(raw_edges)
+    p2p_raw, seg_edges, seg_members, seg_nodes = segmentize_edges(raw_edges, anomalous_by_device)
     p2p_edges = dedup_bidirectional_edges(p2p_raw)
+    seg_neighbor_devs = {seg: sorted({rd for rd, _ in members}) for seg, members in seg_members.items()}
 
     # Only include ports that show up in links (keeps scale reasonable)
     ports_by_device = defaultdict(set)
@@ -227,6 +246,7 @@ def build_model(topology_data, ignore_ports=None):
         seg_nodes=seg_nodes,
         seg_edges=seg_edges,
         seg_members=seg_members,
-        anomalous_ports=anomalous_ports,
+        seg_neighbor_devs=seg_neighbor_devs,
+        anomalous_by_device=anomalous_by_device,
         vlan_membership=vlan_membership,
     )
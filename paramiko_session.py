@@ -0,0 +1,104 @@
+"""Plain Paramiko SSH session for Linux-based devices such as SONiC."""
+
+import logging
+import paramiko
+
+from config import resolve_ssh_params
+from constants import DEFAULT_SSH_PORT
+
+log = logging.getLogger(__name__)
+
+
+class ParamikoSession:
+    """
+    SSH session that runs every command in its own exec channel.
+
+    There is no interactive shell, so no prompt detection or delay factors;
+    the exit status comes straight from the SSH protocol. send_command() and
+    disconnect() mirror the Netmiko calls used elsewhere in this project.
+    """
+
+    def __init__(self, host, username=None, password=None, port=DEFAULT_SSH_PORT, ssh_config_file=None, timeout=None):
+        """
+        Open the SSH connection.
+
+        Args:
+            host: Device hostname, IP address or SSH config alias.
+            username: SSH username.
+            password: SSH password.
+            port: SSH port number.
+            ssh_config_file: Path to SSH config file.
+            timeout: Connect and per-command read timeout in seconds.
+        """
+
+        self.timeout = timeout
+        self.client = paramiko.SSHClient()
+        self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        self.client.connect(**self._connect_params(host, username, password, port, ssh_config_file))
+
+
+    def _connect_params(self, host, username, password, port, ssh_config_file):
+        """Build SSHClient.connect() arguments, applying the SSH config entry for host."""
+
+        ssh_params = resolve_ssh_params(host, username, port, ssh_config_file)
+
+        params = {
+            'hostname': ssh_params['hostname'],
+            'username': ssh_params['username'],
+            'password': password,
+            'port': ssh_params['port'],
+            'timeout': self.timeout,
+        }
+        if ssh_params['identity_file']:
+            params['key_filename'] = ssh_params['identity_file']
+        if ssh_params['proxy_command']:
+            params['sock'] = paramiko.ProxyCommand(ssh_params['proxy_command'])
+
+        return params
+
+
+    @property
+    def transport(self):
+        """Underlying paramiko.Transport."""
+
+        return self.client.get_transport()
+
+
+    def run(self, cmd):
+        """
+        Execute a command in a new channel.
+
+        Args:
+            cmd: Command to execute.
+
+        Returns:
+            Tuple of (exit_code, output) with stderr merged into output.
+        """
+
+        channel = self.transport.open_session(timeout=self.timeout)
+        try:
+            channel.settimeout(self.timeout)
+            channel.set_combine_stderr(True)
+            channel.exec_command(cmd)
+            with channel.makefile("rb") as stdout:
+                output = stdout.read().decode("utf-8", errors="replace")
+            return channel.recv_exit_status(), output
+        finally:
+            channel.close()
+
+
+    def send_command(self, cmd, **kwargs):
+        """
+        Netmiko-compatible subset: run cmd and return its output.
+
+        Netmiko-specific keyword arguments (expect_string, read_timeout, ...)
+        are accepted and ignored, since the channel closes when cmd exits.
+        """
+
+        return self.run(cmd)[1]
+
+
+    def disconnect(self):
+        """Close the SSH connection."""
+
+        self.client.close()
@@ -1,11 +1,86 @@
 """Base router class for network device communication."""
 
-import textfsm
+import io
+import os
+import re
+import sys
+import pickle
 import logging
-from pathlib import Path
+from functools import lru_cache
 
 log = logging.getLogger(__name__)
 
+# Exit-code marker appended to commands. The closing "__" means a read never
+# stops inside a multi-digit code; no end anchor, as a prompt may follow it.
+_RC_RE = re.compile(r"__RC__(\d+)__")
+
+
+@lru_cache(maxsize=64)
+def _compiled_fsm(template_path, mtime_ns):
+    """Compile a TextFSM template once and keep it pickled; mtime_ns is part of the cache key only."""
+
+    import textfsm  # deferred: only needed once output is parsed
+
+    with open(template_path) as f:
+        return pickle.dumps(textfsm.TextFSM(io.StringIO(f.read())))
+
+
+def load_fsm(template_path):
+    """
+    Return a fresh TextFSM parser for a template, compiled once per file version.
+
+    TextFSM parsers are stateful, so each call unpickles a new copy of the
+    compiled parser, which is cheaper than re-parsing the template.
+
+    Args:
+        template_path: Path to TextFSM template file.
+
+    Returns:
+        textfsm.TextFSM instance.
+    """
+
+    return pickle.loads(_compiled_fsm(template_path, os.stat(template_path).st_mtime_ns))
+
+
+def parse_text_to_dicts(re_table, output):
+    """
+    Parse text with a TextFSM table into a list of dicts keyed by header.
+
+    Args:
+        re_table: textfsm.TextFSM instance.
+        output: Text to parse.
+
+    Returns:
+        List of dicts, one per record.
+    """
+
+    # Build the header once (TextFSM's ParseTextToDicts rebuilds it per row) and
+    # intern it, so rows from every call and device share the same key objects
+    header = tuple(map(sys.intern, re_table.header))
+    return [dict(zip(header, row)) for row in re_table.ParseText(output)]
+
+
+def parse_text_to_records(re_table, output, record_cls):
+    """
+    Parse text with a TextFSM table into a list of namedtuple records.
+
+    Records skip the per-row dict and give attribute access to columns.
+
+    Args:
+        re_table: textfsm.TextFSM instance.
+        output: Text to parse.
+        record_cls: namedtuple class whose fields match the template header.
+
+    Returns:
+        List of record_cls instances, one per record.
+    """
+
+    header = tuple(re_table.header)
+    if record_cls._fields != header:
+        raise ValueError(f"{record_cls.__name__} fields {record_cls._fields} do not match template header {header}")
+
+    return list(map(record_cls._make, re_table.ParseText(output)))
+
 
 class Router_Base:
     """Base class for router/switch communication via SSH."""
@@ -28,12 +103,32 @@ class Router_Base:
         self.port = port
         self.ssh_config_file = ssh_config_file
         self.router_connect = None
+        self.read_timeout = None  # default per-command read timeout (None: Netmiko's)
+        self._channel_dirty = False  # a send failed and may have left unread output
 
 
     def disconnect(self):
         """Disconnect from the router."""
 
         self.router_connect = None
+        self._channel_dirty = False
+
+
+    def _send_command(self, cmd, **kwargs):
+        """
+        Send a command, applying the default read_timeout unless the call sets one.
+
+        Args:
+            cmd: Command to send.
+            **kwargs: Extra Netmiko send_command() arguments.
+
+        Returns:
+            Command output as str.
+        """
+
+        if self.read_timeout is not None:
+            kwargs.setdefault("read_timeout", self.read_timeout)
+        return self.router_connect.send_command(cmd, **kwargs)
 
 
     def run_command(self, cmd, check_return_code=True):
@@ -48,20 +143,30 @@ class Router_Base:
             Tuple of (success, output) where success is bool and output is str.
         """
 
+        if self._channel_dirty:
+            # Unread output from the failed command would be read as this one's
+            return False, f"Connection unusable after a failed command, not sending: {cmd}"
+
         if not check_return_code:
             try:
-                output = self.router_connect.send_command(cmd)
+                output = self._send_command(cmd)
                 return True, output
             except Exception as e:
+                self._channel_dirty = True
                 return False, str(e)
 
-        cmd_with_exit = f"{cmd}; echo $?"
+        # Stop reading at the exit-code marker instead of waiting for the prompt
+        cmd_with_exit = f"{{ {cmd}; }}; echo __RC__$?__"
 
         try:
-            output = self.router_connect.send_command(cmd_with_exit)
-            lines = output.strip().splitlines()
-            exit_code = int(lines[-1])
-            command_output = "\n".join(lines[:-1])
+            output = self._send_command(cmd_with_exit, expect_string=r"__RC__\d+__")
+            match = _RC_RE.search(output)
+            if not match:
+                self._channel_dirty = True
+                return False, f"No output received for command: {cmd}"
+
+            exit_code = int(match.group(1))
+            command_output = output[:match.start()].strip()
 
             if exit_code != 0:
                 return False, command_output
@@ -69,19 +174,22 @@ class Router_Base:
             return True, command_output
 
         except Exception as e:
+            self._channel_dirty = True
             return False, str(e)
 
 
-    def parse_with_template(self, command, template_path):
+    def parse_with_template(self, command, template_path, record_cls=None):
         """
         Execute command and parse output using TextFSM template.
 
         Args:
             command: Command to execute.
             template_path: Path to TextFSM template file.
+            record_cls: Optional namedtuple class to build rows with instead of dicts.
 
         Returns:
-            Tuple of (success, parsed_data) where parsed_data is list of dicts.
+            Tuple of (success, parsed_data) where parsed_data is list of dicts,
+            or of record_cls instances when record_cls is given.
         """
 
         status, output = self.run_command(command)
@@ -89,20 +197,13 @@ class Router_Base:
             return False, output
 
         try:
-            template_file = Path(template_path)
-            if not template_file.exists():
-                return False, f"Template file not found: {template_path}"
-
-            with open(template_file) as f:
-                re_table = textfsm.TextFSM(f)
-                header = re_table.header
-                result = re_table.ParseText(output)
-
-                # Convert list of lists to list of dicts
-                structured_data = [
-                    dict(zip(header, row)) for row in result
-                ]
-                return True, structured_data
+            re_table = load_fsm(template_path)
+            if record_cls is not None:
+                return True, parse_text_to_records(re_table, output, record_cls)
+            return True, parse_text_to_dicts(re_table, output)
+
+        except FileNotFoundError:
+            return False, f"Template file not found: {template_path}"
 
         except Exception as e:
             return False, f"TextFSM Error: {str(e)}"
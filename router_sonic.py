@@ -1,24 +1,92 @@
 """SONiC router/switch implementation."""
 
+import re
+import json
 import logging
-from collections import defaultdict
-from netmiko import ConnectHandler
-
-from router_base import Router_Base
+import threading
+from functools import wraps
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from router_base import Router_Base, load_fsm
+from sonic_commands import (
+    HOSTNAME_CMD,
+    DEFAULT_GW_CMD,
+    INTERFACE_STATUS_CMD,
+    LLDP_NEIGHBORS_CMD,
+    VLAN_CONFIG_CMD,
+    InterfaceStatusRow,
+    VlanConfigRow,
+    interface_addr_cmd,
+    interface_info_entry,
+    interface_status_entry,
+    lldp_neighbor_entries,
+    vlan_membership_from_rows
+)
+from sonic_pool import POOL
+from config import load_ssh_config, resolve_ssh_params
 from constants import (
     DEFAULT_SSH_PORT,
+    DEFAULT_DELAY_FACTOR,
+    DEFAULT_FAST_CLI,
+    DEFAULT_READ_TIMEOUT,
+    BULK_READ_TIMEOUT,
+    GATHER_MAX_WORKERS,
+    SSH_MAX_STARTUPS,
     TEXTFSM_DIR,
     INTERFACE_STATUS_TEMPLATE,
-    LLDP_TABLE_TEMPLATE
+    VLAN_CONFIG_TEMPLATE
 )
 
 log = logging.getLogger(__name__)
 
+# Commands issued together by Router_Sonic.collect_all()
+BULK_COMMANDS = (
+    HOSTNAME_CMD,
+    DEFAULT_GW_CMD,
+    INTERFACE_STATUS_CMD,
+    LLDP_NEIGHBORS_CMD,
+    VLAN_CONFIG_CMD,
+)
+
+# The quotes / "$?" keep the echoed command line itself from matching
+_BULK_START = 'echo __MARK_START""__'
+_BULK_START_RE = re.compile(r"__MARK_START__\r?\n?")
+_BULK_MARK_RE = re.compile(r"__MARK_(\d+)_(\d+)__")
+
+
+def _cached_on_instance(name):
+    """
+    Memoize a method's successful (success, value) result on the instance.
+
+    Results live in self._cache until disconnect() clears it; failures are
+    not cached so they can be retried.
+
+    Args:
+        name: Cache key prefix; call arguments are appended to it.
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (name,) + args + tuple(sorted(kwargs.items()))
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+            result = method(self, *args, **kwargs)
+            if result[0]:
+                self._cache[key] = result
+            return result
+        return wrapper
+    return decorator
+
 
 class Router_Sonic(Router_Base):
     """Router implementation for SONiC-based network devices."""
 
-    def __init__(self, host, username=None, password=None, port=DEFAULT_SSH_PORT, ssh_config_file=None):
+    def __init__(self, host, username=None, password=None, port=DEFAULT_SSH_PORT, ssh_config_file=None,
+                 delay_factor=DEFAULT_DELAY_FACTOR, fast_cli=DEFAULT_FAST_CLI, read_timeout=DEFAULT_READ_TIMEOUT,
+                 use_paramiko=False):
         """
         Initialize SONiC router connection.
 
@@ -28,49 +96,265 @@ class Router_Sonic(Router_Base):
             password: SSH password.
             port: SSH port number.
             ssh_config_file: Path to SSH config file.
+            delay_factor: Netmiko global_delay_factor (raise for slow devices).
+            fast_cli: Netmiko fast_cli mode; skips most fixed sleeps.
+            read_timeout: Default per-command read timeout in seconds (None keeps Netmiko's).
+            use_paramiko: Use plain Paramiko exec channels instead of a Netmiko shell.
         """
 
         super().__init__(host, username, password, port, ssh_config_file)
+        self.delay_factor = delay_factor
+        self.fast_cli = fast_cli
+        self.read_timeout = read_timeout
+        self.use_paramiko = use_paramiko
+        self._bulk_cache = None  # {command: (success, output)} filled by collect_all()
+        self._cache = {}  # {key: (success, value)} for per-connection invariants
+
+
+    @classmethod
+    def gather(cls, host_specs, op_name, *args, max_workers=GATHER_MAX_WORKERS):
+        """
+        Run one operation on many devices in parallel.
+
+        Each device is connected, queried and disconnected in its own worker
+        thread. Connection setup is limited to SSH_MAX_STARTUPS at a time per
+        destination, where devices behind the same ProxyJump share one.
+
+        Args:
+            host_specs: List of dicts of Router_Sonic constructor arguments.
+            op_name: Name of the method to call, e.g. "get_lldp_neighbors".
+            *args: Positional arguments passed to the method.
+            max_workers: Maximum number of devices handled concurrently.
+
+        Returns:
+            Dict mapping (host, port) -> (success, result_or_error).
+
+        Raises:
+            ValueError: If two specs share the same host and port.
+        """
+
+        if not host_specs:
+            return {}
+
+        # Devices behind one address (e.g. port-forwarded GNS3 nodes) differ by port
+        keys = [(spec['host'], spec.get('port', DEFAULT_SSH_PORT)) for spec in host_specs]
+        duplicates = [key for key, count in Counter(keys).items() if count > 1]
+        if duplicates:
+            raise ValueError(f"Duplicate device host/port found: {', '.join(f'{h}:{p}' for h, p in duplicates)}")
+
+        startup_limits = {}
+        for spec in host_specs:
+            startup_limits.setdefault(cls._ssh_destination(spec), threading.Semaphore(SSH_MAX_STARTUPS))
+
+        def _run(spec):
+            router = cls(**spec)
+            with startup_limits[cls._ssh_destination(spec)]:
+                status, error = router.connect()
+            if not status:
+                return False, error
+            try:
+                return getattr(router, op_name)(*args)
+            except Exception as e:
+                router._channel_dirty = True  # don't pool a connection in an unknown state
+                return False, str(e)
+            finally:
+                router.disconnect()
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(host_specs))) as executor:
+            futures = {key: executor.submit(_run, spec) for key, spec in zip(keys, host_specs)}
+            return {key: future.result() for key, future in futures.items()}
+
+
+    @staticmethod
+    def _ssh_destination(spec):
+        """SSH server a new connection lands on first: the jump host if any, else the host."""
+
+        ssh_config_file = spec.get('ssh_config_file')
+        if ssh_config_file:
+            try:
+                proxy_jump = load_ssh_config(ssh_config_file).lookup(spec['host']).get('proxyjump')
+            except OSError:
+                proxy_jump = None
+            if proxy_jump:
+                return proxy_jump
+        return spec['host']
 
 
     def connect(self):
         """
         Establish SSH connection to SONiC device.
 
+        An idle pooled connection with the same settings is reused if available.
+        With use_paramiko, a ParamikoSession is used instead of a Netmiko shell.
+
         Returns:
             Tuple of (success, error_message).
         """
 
-        connection_params = {
-            'device_type': 'linux',
-            'host': self.host,
-            'username': self.username,
-            'password': self.password,
-            'port': self.port,
-            "global_delay_factor": 3,
-            "fast_cli": False,
-            "ssh_config_file": self.ssh_config_file
-        }
+        # Transport modules are imported on first connect to keep startup fast
+        if self.use_paramiko:
+            from paramiko_session import ParamikoSession
+
+            # SONiC is a plain Linux host: no prompt handling is needed
+            factory = lambda: ParamikoSession(
+                self.host,
+                username=self.username,
+                password=self.password,
+                port=self.port,
+                ssh_config_file=self.ssh_config_file,
+                timeout=self.read_timeout
+            )
+        else:
+            import paramiko
+            from netmiko import ConnectHandler
+
+            # Resolve the SSH config here (parsed once per file and shared) rather
+            # than passing ssh_config_file, which Netmiko re-reads on every connect
+            try:
+                ssh_params = resolve_ssh_params(self.host, self.username, self.port, self.ssh_config_file)
+            except Exception as e:
+                return False, str(e)
+
+            connection_params = {
+                'device_type': 'linux',
+                'host': ssh_params['hostname'],
+                'username': ssh_params['username'],
+                'password': self.password,
+                'port': ssh_params['port'],
+                "global_delay_factor": self.delay_factor,
+                "fast_cli": self.fast_cli
+            }
+            if ssh_params['identity_file']:
+                connection_params['key_file'] = ssh_params['identity_file']
+                connection_params['use_keys'] = True
+
+            def factory():
+                # A ProxyCommand socket serves one connection, so open it per connect
+                proxy_command = ssh_params['proxy_command']
+                sock = paramiko.ProxyCommand(proxy_command) if proxy_command else None
+                return ConnectHandler(sock=sock, **connection_params)
 
         try:
-            self.router_connect = ConnectHandler(**connection_params)
+            self.router_connect = POOL.acquire(self._pool_key(), factory)
             return True, None
         except Exception as e:
             return False, str(e)
 
 
     def disconnect(self):
-        """Disconnect from SONiC device."""
+        """
+        Release the SSH connection back to the connection pool.
+
+        A connection on which a command failed or timed out is closed instead,
+        since its channel may still hold that command's unread output.
+        """
 
         if self.router_connect:
-            try:
-                self.router_connect.disconnect()
-            except Exception:
-                pass  # Ignore errors during disconnect
+            if self._channel_dirty:
+                POOL.discard(self.router_connect)
+            else:
+                POOL.release(self._pool_key(), self.router_connect)
 
+        self._bulk_cache = None
+        self._cache.clear()
         super().disconnect()
 
 
+    def run_command(self, cmd, check_return_code=True):
+        """
+        Execute a command, serving discovery commands from the bulk cache.
+
+        The first discovery command triggers collect_all(), which fetches
+        all of BULK_COMMANDS in a single round-trip.
+
+        Args:
+            cmd: Command to execute.
+            check_return_code: Whether to check command exit code.
+
+        Returns:
+            Tuple of (success, output) where success is bool and output is str.
+        """
+
+        if cmd in BULK_COMMANDS:
+            if self._bulk_cache is None:
+                self.collect_all()
+            cached = self._bulk_cache.get(cmd)
+            if cached is not None:
+                return cached
+
+        if self.use_paramiko:
+            # Exit status comes from the channel; no 'echo $?' round-trip
+            try:
+                exit_code, output = self.router_connect.run(cmd)
+            except Exception as e:
+                self._channel_dirty = True
+                return False, str(e)
+            return (exit_code == 0 or not check_return_code), output.strip()
+
+        return super().run_command(cmd, check_return_code)
+
+
+    def collect_all(self):
+        """
+        Run all discovery commands in one SSH send and split their outputs.
+
+        Each command is followed by a marker carrying its index and exit code,
+        so outputs and statuses are recovered from a single response.
+
+        Returns:
+            Tuple of (success, outputs_or_error).
+            outputs is dict mapping command -> (success, output).
+        """
+
+        self._bulk_cache = {}
+
+        last = len(BULK_COMMANDS) - 1
+        cmd = "; ".join(
+            [_BULK_START] +
+            [f"{c}; echo __MARK_{i}_$?__" for i, c in enumerate(BULK_COMMANDS)]
+        )
+
+        try:
+            # The bulk send covers every discovery command, so allow it longer
+            output = self._send_command(
+                cmd,
+                expect_string=rf"__MARK_{last}_\d+__",
+                read_timeout=max(BULK_READ_TIMEOUT, self.read_timeout or 0),
+                cmd_verify=False  # long echoed line may wrap; markers delimit output
+            )
+        except Exception as e:
+            # The shell may still be running the bulk script: answer every bulk
+            # command with this error rather than sending them on that channel
+            self._channel_dirty = True
+            self._bulk_cache = dict.fromkeys(BULK_COMMANDS, (False, str(e)))
+            return False, str(e)
+
+        start = _BULK_START_RE.search(output)
+        pos = start.end() if start else 0
+
+        outputs = {}
+        for m in _BULK_MARK_RE.finditer(output, pos):
+            index, exit_code = int(m.group(1)), int(m.group(2))
+            if index <= last:
+                outputs[BULK_COMMANDS[index]] = (exit_code == 0, output[pos:m.start()].strip())
+            pos = m.end()
+
+        self._bulk_cache = outputs
+        return True, dict(outputs)
+
+
+    def _pool_key(self):
+        """Connection pool key for this device."""
+
+        # Everything that shapes the session, so differently configured
+        # connections to the same device are never handed out for each other
+        return (
+            self.host, self.username, self.password, self.port, self.ssh_config_file,
+            self.use_paramiko, self.fast_cli, self.delay_factor, self.read_timeout
+        )
+
+
+    @_cached_on_instance("mgmt_ip")
     def get_mgmt_ip(self, interface="eth0"):
         """
         Get management IP address for an interface.
@@ -102,29 +386,25 @@ class Router_Sonic(Router_Base):
 
         Returns:
             Tuple of (success, interface_info_or_error).
+            interface_info is dict with keys: Interface, State, Mtu, Mac, Ip, Prefix.
         """
 
-        status, output = self.run_command(f"ip addr show {interface}")
+        status, output = self.run_command(interface_addr_cmd(interface))
         if not status:
             return False, output
 
-        template_path = f"{TEXTFSM_DIR}/ip_address_show.textfsm"
         try:
-            import textfsm
-            with open(template_path) as template_file:
-                fsm = textfsm.TextFSM(template_file)
-                parsed_output = fsm.ParseText(output)
+            info = interface_info_entry(json.loads(output), interface)
+        except ValueError as e:
+            return False, f"Error parsing interface info: {str(e)}"
 
-            result = [dict(zip(fsm.header, row)) for row in parsed_output]
+        if info is None:
+            return False, f"Cannot find interface {interface} info"
 
-            if not result:
-                return False, f"Cannot find interface {interface} info"
-
-            return True, result[0]
-        except Exception as e:
-            return False, f"Error parsing interface info: {str(e)}"
+        return True, info
 
 
+    @_cached_on_instance("gw")
     def get_default_gw(self):
         """
         Get default gateway IP address.
@@ -133,14 +413,14 @@ class Router_Sonic(Router_Base):
             Tuple of (success, gateway_ip_or_error).
         """
 
-        cmd = "ip route show default | awk '/default/ {print $3}'"
-        status, output = self.run_command(cmd)
+        status, output = self.run_command(DEFAULT_GW_CMD)
         if not status:
             return False, output
 
         return True, output.strip()
 
 
+    @_cached_on_instance("hostname")
     def get_hostname(self):
         """
         Get device hostname.
@@ -148,7 +428,7 @@ class Router_Sonic(Router_Base):
         Returns:
             Tuple of (success, hostname_or_error).
         """
-        status, output = self.run_command("hostname")
+        status, output = self.run_command(HOSTNAME_CMD)
         if not status:
             return False, output
 
@@ -166,29 +446,15 @@ class Router_Sonic(Router_Base):
 
         template_path = f"{TEXTFSM_DIR}/{INTERFACE_STATUS_TEMPLATE}"
         status, data = self.parse_with_template(
-            "show interfaces status",
-            template_path
+            INTERFACE_STATUS_CMD,
+            template_path,
+            InterfaceStatusRow
         )
         if not status:
             return False, data
 
-        # Convert list of dicts to a single dict keyed by Interface name
-        interfaces_map = {}
-        for row in data:
-            name = row['Interface']
-            vlan_value = row.get('Vlan', 'N/A')
-            # Handle empty or default VLAN values
-            vlan = vlan_value if vlan_value and vlan_value != 'N/A' and vlan_value.strip() else None
-            interfaces_map[name] = {
-                "lanes": row['Lanes'],
-                "speed": row['Speed'],
-                "mtu": row['MTU'],
-                "fec": row['FEC'],
-                "alias": row['Alias'],
-                "status": "up" if row['Oper'].lower() == "up" else "down",
-                "type": row['Type'],
-                "vlan": vlan,
-            }
+        # Convert list of records to a single dict keyed by Interface name
+        interfaces_map = {row.Interface: interface_status_entry(row) for row in data}
 
         return True, interfaces_map
 
@@ -202,24 +468,16 @@ class Router_Sonic(Router_Base):
             lldp_data is list of dicts with keys: local_port, remote_dev, remote_port.
         """
 
-        template_path = f"{TEXTFSM_DIR}/{LLDP_TABLE_TEMPLATE}"
-        status, data = self.parse_with_template(
-            "show lldp table",
-            template_path
-        )
+        status, output = self.run_command(LLDP_NEIGHBORS_CMD)
         if not status:
-            return False, data
+            return False, output
 
-        # Normalize keys for the visualizer
-        normalized_data = []
-        for row in data:
-            normalized_data.append({
-                "local_port": row['LocalPort'],
-                "remote_dev": row['RemoteDevice'],
-                "remote_port": row['RemotePortDescr']  # Description matches SONiC logical names
-            })
+        try:
+            data = json.loads(output)
+        except ValueError as e:
+            return False, f"Error parsing LLDP neighbors: {str(e)}"
 
-        return True, normalized_data
+        return True, lldp_neighbor_entries(data)
 
 
     def get_vlan_membership(self):
@@ -232,36 +490,29 @@ class Router_Sonic(Router_Base):
         """
 
         # Use 'show vlan config' which has a simpler format: one row per port-VLAN mapping
-        template_path = f"{TEXTFSM_DIR}/show_vlan_config.textfsm"
+        template_path = f"{TEXTFSM_DIR}/{VLAN_CONFIG_TEMPLATE}"
         status, data = self.parse_with_template(
-            "show vlan config",
-            template_path
+            VLAN_CONFIG_CMD,
+            template_path,
+            VlanConfigRow
         )
 
         if not status:
             log.warning(f"Could not parse VLAN membership: {data}")
             return True, {}  # Return empty dict, not an error
 
-        # Parse the output: data is list of dicts with VLAN_ID, MEMBER (port name)
-        vlan_membership = defaultdict(list)
-
-        for row in data:
-            vlan_id = row.get('VLAN_ID', '').strip()
-            member = row.get('MEMBER', '').strip()
-
-            if not vlan_id or not member:
-                continue
-
-            # Normalize port name to EthernetX format
-            if member.startswith('Ethernet'):
-                vlan_membership[vlan_id].append(member)
-            elif member.startswith('eth'):
-                # Convert ethX to EthernetX
-                try:
-                    eth_num = member.replace('eth', '').replace('E', '')
-                    port = f"Ethernet{eth_num}"
-                    vlan_membership[vlan_id].append(port)
-                except:
-                    continue
-
-        return True, dict(vlan_membership)
+        return True, vlan_membership_from_rows(data)
+
+
+def _warm_fsm_cache():
+    """Compile the discovery TextFSM templates ahead of their first use."""
+
+    for template in (INTERFACE_STATUS_TEMPLATE, VLAN_CONFIG_TEMPLATE):
+        try:
+            load_fsm(f"{TEXTFSM_DIR}/{template}")
+        except Exception as e:
+            log.debug(f"Could not pre-compile {template}: {e}")
+
+
+# Overlap template compilation with the SSH handshakes of the first devices
+threading.Thread(target=_warm_fsm_cache, name="fsm-warmup", daemon=True).start()
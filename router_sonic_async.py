@@ -0,0 +1,281 @@
+"""Asynchronous SONiC router/switch implementation based on AsyncSSH."""
+
+import json
+import logging
+import asyncssh
+
+from router_base import load_fsm, parse_text_to_dicts, parse_text_to_records
+from sonic_commands import (
+    HOSTNAME_CMD,
+    DEFAULT_GW_CMD,
+    INTERFACE_STATUS_CMD,
+    LLDP_NEIGHBORS_CMD,
+    VLAN_CONFIG_CMD,
+    InterfaceStatusRow,
+    VlanConfigRow,
+    interface_addr_cmd,
+    interface_info_entry,
+    interface_status_entry,
+    lldp_neighbor_entries,
+    vlan_membership_from_rows
+)
+from constants import (
+    DEFAULT_SSH_PORT,
+    TEXTFSM_DIR,
+    INTERFACE_STATUS_TEMPLATE,
+    VLAN_CONFIG_TEMPLATE
+)
+
+log = logging.getLogger(__name__)
+
+
+class Router_SonicAsync:
+    """
+    SONiC device accessed over AsyncSSH.
+
+    Every method is a coroutine, so one event loop can query many devices at
+    once, e.g. asyncio.gather(*(r.get_lldp_neighbors() for r in routers)).
+    The query methods (get_hostname, get_default_gw, get_mgmt_ip,
+    get_interface_info, get_interface_status_map, get_lldp_neighbors,
+    get_vlan_membership) return the same (success, data) results as
+    Router_Sonic. Each command runs in its own channel, so there is no
+    collect_all() bulk send.
+    """
+
+    def __init__(self, host, username=None, password=None, port=DEFAULT_SSH_PORT, ssh_config_file=None):
+        """
+        Initialize SONiC router connection parameters.
+
+        Args:
+            host: Device hostname or IP address.
+            username: SSH username.
+            password: SSH password.
+            port: SSH port number.
+            ssh_config_file: Path to SSH config file.
+        """
+
+        self.host = host
+        self.username = username
+        self.password = password
+        self.port = port
+        self.ssh_config_file = ssh_config_file
+        self._conn = None
+
+
+    async def connect(self):
+        """
+        Establish SSH connection to SONiC device.
+
+        Returns:
+            Tuple of (success, error_message).
+        """
+
+        connection_params = {
+            'port': self.port,
+            'known_hosts': None,
+            'config': [self.ssh_config_file] if self.ssh_config_file else (),
+        }
+        if self.username:
+            connection_params['username'] = self.username
+        if self.password:
+            connection_params['password'] = self.password
+
+        try:
+            self._conn = await asyncssh.connect(self.host, **connection_params)
+            return True, None
+        except Exception as e:
+            return False, str(e)
+
+
+    async def disconnect(self):
+        """Disconnect from SONiC device."""
+
+        if self._conn:
+            try:
+                self._conn.close()
+                await self._conn.wait_closed()
+            except Exception:
+                pass  # Ignore errors during disconnect
+
+        self._conn = None
+
+
+    async def run_command(self, cmd):
+        """
+        Execute a command on the router in its own SSH channel.
+
+        The exit status comes from the SSH protocol, so no 'echo $?' is needed.
+
+        Args:
+            cmd: Command to execute.
+
+        Returns:
+            Tuple of (success, output) where success is bool and output is str.
+        """
+
+        try:
+            result = await self._conn.run(cmd, check=False)
+        except Exception as e:
+            return False, str(e)
+
+        output = (result.stdout or "").strip()
+        if result.exit_status != 0:
+            return False, output or (result.stderr or "").strip()
+
+        return True, output
+
+
+    async def parse_with_template(self, command, template_path, record_cls=None):
+        """
+        Execute command and parse output using TextFSM template.
+
+        Args:
+            command: Command to execute.
+            template_path: Path to TextFSM template file.
+            record_cls: Optional namedtuple class to build rows with instead of dicts.
+
+        Returns:
+            Tuple of (success, parsed_data) where parsed_data is list of dicts,
+            or of record_cls instances when record_cls is given.
+        """
+
+        status, output = await self.run_command(command)
+        if not status:
+            return False, output
+
+        try:
+            re_table = load_fsm(template_path)
+            if record_cls is not None:
+                return True, parse_text_to_records(re_table, output, record_cls)
+            return True, parse_text_to_dicts(re_table, output)
+        except FileNotFoundError:
+            return False, f"Template file not found: {template_path}"
+        except Exception as e:
+            return False, f"TextFSM Error: {str(e)}"
+
+
+    async def get_mgmt_ip(self, interface="eth0"):
+        """
+        Get management IP address for an interface.
+
+        Args:
+            interface: Interface name to query.
+
+        Returns:
+            Tuple of (success, ip_address_or_error).
+        """
+
+        status, output = await self.get_interface_info(interface)
+        if not status:
+            return False, output
+
+        ip_address = output.get("Ip", None)
+        if not ip_address:
+            return False, f"No IP address assigned to {interface}"
+
+        return True, ip_address
+
+
+    async def get_interface_info(self, interface):
+        """
+        Get interface information.
+
+        Args:
+            interface: Interface name to query.
+
+        Returns:
+            Tuple of (success, interface_info_or_error).
+            interface_info is dict with keys: Interface, State, Mtu, Mac, Ip, Prefix.
+        """
+
+        status, output = await self.run_command(interface_addr_cmd(interface))
+        if not status:
+            return False, output
+
+        try:
+            info = interface_info_entry(json.loads(output), interface)
+        except ValueError as e:
+            return False, f"Error parsing interface info: {str(e)}"
+
+        if info is None:
+            return False, f"Cannot find interface {interface} info"
+
+        return True, info
+
+
+    async def get_hostname(self):
+        """
+        Get device hostname.
+
+        Returns:
+            Tuple of (success, hostname_or_error).
+        """
+
+        return await self.run_command(HOSTNAME_CMD)
+
+
+    async def get_default_gw(self):
+        """
+        Get default gateway IP address.
+
+        Returns:
+            Tuple of (success, gateway_ip_or_error).
+        """
+
+        return await self.run_command(DEFAULT_GW_CMD)
+
+
+    async def get_interface_status_map(self):
+        """
+        Get interface status map for all interfaces.
+
+        Returns:
+            Tuple of (success, interfaces_map_or_error).
+            interfaces_map is dict keyed by interface name.
+        """
+
+        template_path = f"{TEXTFSM_DIR}/{INTERFACE_STATUS_TEMPLATE}"
+        status, data = await self.parse_with_template(INTERFACE_STATUS_CMD, template_path, InterfaceStatusRow)
+        if not status:
+            return False, data
+
+        return True, {row.Interface: interface_status_entry(row) for row in data}
+
+
+    async def get_lldp_neighbors(self):
+        """
+        Get LLDP neighbor information.
+
+        Returns:
+            Tuple of (success, lldp_data_or_error).
+            lldp_data is list of dicts with keys: local_port, remote_dev, remote_port.
+        """
+
+        status, output = await self.run_command(LLDP_NEIGHBORS_CMD)
+        if not status:
+            return False, output
+
+        try:
+            data = json.loads(output)
+        except ValueError as e:
+            return False, f"Error parsing LLDP neighbors: {str(e)}"
+
+        return True, lldp_neighbor_entries(data)
+
+
+    async def get_vlan_membership(self):
+        """
+        Get VLAN membership information - which ports belong to which VLANs.
+
+        Returns:
+            Tuple of (success, vlan_membership_or_error).
+            vlan_membership is dict mapping VLAN_ID -> list of port names.
+        """
+
+        template_path = f"{TEXTFSM_DIR}/{VLAN_CONFIG_TEMPLATE}"
+        status, data = await self.parse_with_template(VLAN_CONFIG_CMD, template_path, VlanConfigRow)
+        if not status:
+            log.warning(f"Could not parse VLAN membership: {data}")
+            return True, {}  # Return empty dict, not an error
+
+        return True, vlan_membership_from_rows(data)
@@ -0,0 +1,154 @@
+"""SONiC discovery commands and the parsers for their output.
+
+Shared by Router_Sonic and Router_SonicAsync, so both return identical data.
+"""
+
+import re
+import shlex
+from itertools import groupby
+from operator import itemgetter
+from collections import namedtuple
+
+HOSTNAME_CMD = "hostname"
+DEFAULT_GW_CMD = "ip route show default | awk '/default/ {print $3}'"
+INTERFACE_STATUS_CMD = "show interfaces status"
+# lldpd's own JSON output; 'show lldp table' wraps the same data in ASCII columns
+LLDP_NEIGHBORS_CMD = "sudo docker exec lldp lldpctl -f json0"
+VLAN_CONFIG_CMD = "show vlan config"
+
+# Parsed TextFSM rows; fields follow the Value order of each template
+InterfaceStatusRow = namedtuple(
+    "InterfaceStatusRow",
+    ("Interface", "Lanes", "Speed", "MTU", "FEC", "Alias", "Vlan", "Oper", "Admin", "Type", "AsymPFC")
+)
+VlanConfigRow = namedtuple("VlanConfigRow", ("VLAN_ID", "VLAN_NAME", "MEMBER", "MODE"))
+
+_OPER_UP = frozenset(("up", "UP", "Up"))
+
+# VLAN member port names: EthernetX, ethX or ethEX
+_VLAN_MEMBER_PORT_RE = re.compile(r"^(?:Ethernet|ethE?)(\d+)$")
+
+
+def interface_addr_cmd(interface):
+    """
+    Build the iproute2 JSON command for one interface.
+
+    Args:
+        interface: Interface name to query.
+
+    Returns:
+        Shell command string.
+    """
+
+    # iproute2 JSON output avoids parsing free-form 'ip addr' text
+    return f"ip -j addr show {shlex.quote(interface)}"
+
+
+def interface_info_entry(data, interface):
+    """
+    Build the interface info dict from decoded 'ip -j addr show' output.
+
+    Args:
+        data: Decoded iproute2 JSON (list of interfaces).
+        interface: Interface name that was queried.
+
+    Returns:
+        Dict with keys: Interface, State, Mtu, Mac, Ip, Prefix; None if data is empty.
+    """
+
+    if not data:
+        return None
+
+    info = data[0]
+    ipv4 = next((a for a in info.get("addr_info", []) if a.get("family") == "inet"), {})
+
+    return {
+        "Interface": info.get("ifname", interface),
+        "State": info.get("operstate"),
+        "Mtu": info.get("mtu"),
+        "Mac": info.get("address"),
+        "Ip": ipv4.get("local"),
+        "Prefix": ipv4.get("prefixlen"),
+    }
+
+
+def interface_status_entry(row):
+    """
+    Build the interface map entry for one 'show interfaces status' row.
+
+    Args:
+        row: Parsed InterfaceStatusRow.
+
+    Returns:
+        Dict with lanes, speed, mtu, fec, alias, status, type and vlan.
+    """
+
+    vlan = row.Vlan
+    return {
+        "lanes": row.Lanes,
+        "speed": row.Speed,
+        "mtu": row.MTU,
+        "fec": row.FEC,
+        "alias": row.Alias,
+        "status": "up" if row.Oper in _OPER_UP else "down",
+        "type": row.Type,
+        # Handle empty or default VLAN values
+        "vlan": vlan if vlan and vlan != 'N/A' and vlan.strip() else None,
+    }
+
+
+def _first_value(items):
+    """Return the 'value' of the first entry of a json0 list, or "" when absent."""
+
+    return items[0].get("value", "") if items else ""
+
+
+def lldp_neighbor_entries(data):
+    """
+    Normalize 'lldpctl -f json0' output for the visualizer.
+
+    Args:
+        data: Decoded lldpctl JSON (json0 format, every object wrapped in a list).
+
+    Returns:
+        List of dicts with keys: local_port, remote_dev, remote_port.
+    """
+
+    neighbors = []
+    for lldp in data.get("lldp", []):
+        for iface in lldp.get("interface", []):
+            chassis = (iface.get("chassis") or [{}])[0]
+            port = (iface.get("port") or [{}])[0]
+            neighbors.append({
+                "local_port": iface.get("name", ""),
+                "remote_dev": _first_value(chassis.get("name")),
+                "remote_port": _first_value(port.get("descr"))  # Description matches SONiC logical names
+            })
+
+    return neighbors
+
+
+def vlan_membership_from_rows(data):
+    """
+    Group parsed 'show vlan config' rows into VLAN membership.
+
+    Args:
+        data: List of parsed VlanConfigRow records.
+
+    Returns:
+        Dict mapping VLAN_ID -> list of port names.
+    """
+
+    # data is list of records with VLAN_ID, MEMBER (port name); keep rows whose
+    # member normalizes (EthernetX / ethX) to EthernetX format
+    rows = [
+        (vlan_id, f"Ethernet{m.group(1)}")
+        for row in data
+        if (vlan_id := row.VLAN_ID.strip())
+        and (m := _VLAN_MEMBER_PORT_RE.match(row.MEMBER.strip()))
+    ]
+
+    # Numeric VLAN order, as the device lists them ("200" before "1000"); the
+    # stable sort keeps each VLAN's ports in their original order
+    rows.sort(key=lambda r: int(r[0]))
+    return {vlan_id: [port for _, port in group] for vlan_id, group in groupby(rows, key=itemgetter(0))}
@@ -0,0 +1,193 @@
+"""Process-wide pool of reusable SSH connections."""
+
+import os
+import time
+import atexit
+import logging
+import threading
+
+from constants import POOL_IDLE_TIMEOUT, POOL_MAX_AGE, SSH_KEEPALIVE_INTERVAL
+
+log = logging.getLogger(__name__)
+
+
+def _ssh_transport(conn):
+    """Return the paramiko.Transport behind a connection, or None if unknown."""
+
+    # ParamikoSession exposes it directly; Netmiko via its paramiko channel
+    transport = getattr(conn, "transport", None)
+    if transport is None:
+        transport = getattr(getattr(conn, "remote_conn", None), "transport", None)
+    return transport
+
+
+def _is_alive(conn):
+    """Cheap liveness probe: transport active and an SSH_MSG_IGNORE can be sent."""
+
+    transport = _ssh_transport(conn)
+    if transport is None:
+        return True  # Nothing to probe; trust the connection
+
+    try:
+        if not transport.is_active():
+            return False
+        transport.send_ignore()
+        return True
+    except Exception:
+        return False
+
+
+class ConnectionPool:
+    """Keeps idle connections keyed by their connection settings for reuse."""
+
+    def __init__(self, idle_timeout=POOL_IDLE_TIMEOUT, max_age=POOL_MAX_AGE, keepalive=SSH_KEEPALIVE_INTERVAL):
+        """
+        Initialize an empty pool.
+
+        Args:
+            idle_timeout: Seconds an idle connection is kept before closing.
+            max_age: Seconds after which a connection is closed regardless of use.
+            keepalive: SSH keepalive interval in seconds for new connections (0 disables).
+        """
+
+        self.idle_timeout = idle_timeout
+        self.max_age = max_age
+        self.keepalive = keepalive
+        self._lock = threading.RLock()
+        self._idle = {}  # {key: [(conn, last_used, created_at), ...]}
+        self._in_use = {}  # {id(conn): created_at}
+
+
+    def acquire(self, key, factory):
+        """
+        Get an idle connection for key, or create one with factory.
+
+        The caller owns the returned connection until it calls release().
+
+        Args:
+            key: Pool key, e.g. (host, username, port, ...).
+            factory: Zero-argument callable that opens a new connection.
+
+        Returns:
+            Connection object.
+        """
+
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                expired = self._sweep(now)
+                entries = self._idle.get(key)
+                conn = None
+                if entries:
+                    conn, _last_used, created_at = entries.pop()
+                    self._in_use[id(conn)] = created_at
+
+            self._close_all(expired)
+
+            if conn is None:
+                break
+            if _is_alive(conn):
+                log.debug(f"Reusing pooled connection to {key[0]}")
+                return conn
+
+            # Dead pooled connection (e.g. dropped by sshd); discard and retry
+            log.debug(f"Discarding dead pooled connection to {key[0]}")
+            with self._lock:
+                self._in_use.pop(id(conn), None)
+            self._close_all([conn])
+
+        # Connect outside the lock so slow handshakes don't serialize callers
+        conn = factory()
+        if self.keepalive:
+            transport = _ssh_transport(conn)
+            if transport is not None:
+                transport.set_keepalive(self.keepalive)
+        with self._lock:
+            self._in_use[id(conn)] = time.monotonic()
+        return conn
+
+
+    def release(self, key, conn):
+        """
+        Return a connection to the pool, closing it if it is too old.
+
+        Args:
+            key: Pool key the connection was acquired with.
+            conn: Connection returned by acquire().
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            created_at = self._in_use.pop(id(conn), now)
+            if now - created_at < self.max_age:
+                self._idle.setdefault(key, []).append((conn, now, created_at))
+                conn = None
+            expired = self._sweep(now)
+
+        if conn is not None:
+            expired.append(conn)
+        self._close_all(expired)
+
+
+    def discard(self, conn):
+        """
+        Close a checked-out connection instead of returning it to the pool.
+
+        Used when a command failed or timed out and the channel may still
+        hold output that would leak into the next caller's command.
+
+        Args:
+            conn: Connection returned by acquire().
+        """
+
+        with self._lock:
+            self._in_use.pop(id(conn), None)
+
+        self._close_all([conn])
+
+
+    def close_all(self):
+        """Close every idle connection in the pool."""
+
+        with self._lock:
+            conns = [conn for entries in self._idle.values() for conn, _, _ in entries]
+            self._idle.clear()
+
+        self._close_all(conns)
+
+
+    def _sweep(self, now):
+        """Remove expired idle connections; caller holds the lock and closes them."""
+
+        expired = []
+        for key in list(self._idle):
+            keep = []
+            for conn, last_used, created_at in self._idle[key]:
+                if now - last_used >= self.idle_timeout or now - created_at >= self.max_age:
+                    expired.append(conn)
+                else:
+                    keep.append((conn, last_used, created_at))
+            if keep:
+                self._idle[key] = keep
+            else:
+                del self._idle[key]
+        return expired
+
+
+    @staticmethod
+    def _close_all(conns):
+        """Disconnect connections, ignoring errors."""
+
+        for conn in conns:
+            try:
+                conn.disconnect()
+            except Exception:
+                pass  # Ignore errors during disconnect
+
+
+POOL = ConnectionPool(
+    idle_timeout=float(os.environ.get("SONIC_POOL_IDLE_TIMEOUT", POOL_IDLE_TIMEOUT)),
+    max_age=float(os.environ.get("SONIC_POOL_MAX_AGE", POOL_MAX_AGE)),
+)
+
+atexit.register(POOL.close_all)